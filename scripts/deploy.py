@@ -11,6 +11,8 @@ artifacts to ensure a clean state after failures.
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
 import json
 import logging
 import os
@@ -18,17 +20,38 @@ import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional C serializer; stdlib json is the fallback.
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import yaml
+except ImportError:  # Only needed to derive the sparse checkout set.
+    yaml = None  # type: ignore[assignment]
 
 REPO_URL = "https://github.com/google/oss-fuzz.git"
+REPO_BRANCH = "master"
+CLONE_FILTER = "blob:none"
 ROOT_DIR = Path(__file__).resolve().parent.parent
 OSS_FUZZ_DIR = ROOT_DIR / "oss-fuzz"
+OSS_FUZZ_MIRROR = ROOT_DIR / ".cache" / "oss-fuzz.git"
 ARTIFACT_DIR = ROOT_DIR / "artifacts"
 LOG_DIR = ROOT_DIR / "logs"
 CONFIG_DIR = ROOT_DIR / "config"
 COMPOSE_FILE = ROOT_DIR / "docker-compose.yml"
+DOCKERFILE = ROOT_DIR / "docker" / "oss_fuzz_env.Dockerfile"
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+HEALTHCHECK_SCRIPT = ROOT_DIR / "docker" / "healthcheck.sh"
 STATE_FILE = ROOT_DIR / ".deploy_state.json"
+BUILD_ENV = {
+    "DOCKER_BUILDKIT": "1",
+    "COMPOSE_DOCKER_CLI_BUILD": "1",
+}
 
 
 class DeployError(Exception):
@@ -41,6 +64,7 @@ def run_command(
     cwd: Path | None = None,
     check: bool = True,
     capture_output: bool = False,
+    env: Mapping[str, str] | None = None,
 ) -> subprocess.CompletedProcess:
     """
     Run a shell command with logging and error translation.
@@ -50,6 +74,7 @@ def run_command(
         cwd: Optional working directory.
         check: Raise DeployError when exit status is non-zero.
         capture_output: When True, capture stdout/stderr.
+        env: Optional variables merged over the current environment.
     """
     logging.debug("Running command: %s", " ".join(command))
     try:
@@ -59,6 +84,7 @@ def run_command(
             check=False,
             capture_output=capture_output,
             text=True,
+            env={**os.environ, **env} if env else None,
         )
     except FileNotFoundError as exc:
         raise DeployError(f"Command not found: {command[0]}") from exc
@@ -74,13 +100,92 @@ def run_command(
 
 
 def _command_exists(cmd: List[str]) -> bool:
+    return _probe_command(tuple(cmd))
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_command(cmd: Tuple[str, ...]) -> bool:
     try:
-        run_command(cmd, capture_output=True)
+        run_command(list(cmd), capture_output=True)
         return True
     except DeployError:
         return False
 
 
+def _configured_projects(config_file: Path) -> List[str]:
+    """
+    Return the OSS-Fuzz projects referenced by the target config.
+
+    Disabled targets are included so they can be enabled without a redeploy.
+    An empty list means the projects could not be determined and the caller
+    should fall back to a full checkout.
+    """
+    if yaml is None:
+        logging.warning("PyYAML is not installed; sparse checkout disabled.")
+        return []
+    try:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        data = yaml.load(config_file.read_bytes(), Loader=loader)
+    except (OSError, yaml.YAMLError) as exc:
+        logging.warning("Unable to read %s for sparse checkout: %s", config_file, exc)
+        return []
+
+    targets = data.get("targets") if isinstance(data, dict) else None
+    if not isinstance(targets, list):
+        return []
+    projects = {
+        entry["project"]
+        for entry in targets
+        if isinstance(entry, dict) and isinstance(entry.get("project"), str)
+    }
+    return sorted(projects)
+
+
+def _docker_sockets() -> List[Path]:
+    sockets = [Path("/var/run/docker.sock")]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        sockets.append(Path(runtime_dir) / "docker.sock")  # rootless docker
+    return sockets
+
+
+def _dump_state(state: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2)
+    return json.dumps(state, indent=2).encode()
+
+
+def _load_state() -> Dict[str, Any]:
+    raw = STATE_FILE.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _state_hash(commit: str | None) -> str:
+    """Fingerprint the inputs that shape a deployment."""
+    digest = hashlib.blake2b(digest_size=16)
+    # The compose/Dockerfile pair plus everything the runner image COPYs.
+    for root in (COMPOSE_FILE, DOCKERFILE, CONFIG_DIR, SCRIPTS_DIR, HEALTHCHECK_SCRIPT):
+        if root.is_dir():
+            paths = sorted(
+                path
+                for path in root.rglob("*")
+                if path.is_file() and "__pycache__" not in path.parts
+            )
+        else:
+            paths = [root]
+        for path in paths:
+            digest.update(f"{root.name}/{path.relative_to(root)}\0".encode())
+            digest.update(path.read_bytes() if path.exists() else b"")
+            digest.update(b"\0")
+    digest.update((commit or "").encode())
+    return digest.hexdigest()
+
+
+def _remove_tree(path: Path) -> None:
+    logging.debug("Removing %s", path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
 class DeployManager:
     def __init__(
         self,
@@ -95,16 +200,25 @@ class DeployManager:
         self.rollback_on_failure = rollback_on_failure
         self.force_reclone = force_reclone
         self.compose_base_cmd: List[str] | None = None
+        self._compose_exists = COMPOSE_FILE.exists()
+        self._daemon_ok = False
 
     def deploy(self) -> None:
         logging.info("Starting OSS-Fuzz environment deployment...")
         try:
             self._ensure_prerequisites()
             self._prepare_directories()
-            self._sync_oss_fuzz_repo()
             self._ensure_config()
-            if not self.skip_build:
-                self._build_images()
+            # Fetch first so the skip check compares against upstream, not the
+            # commit the worktree happens to be on.
+            self._sync_mirror()
+            if self._maybe_skip():
+                logging.info(
+                    "Build inputs and upstream oss-fuzz commit are unchanged and all "
+                    "services are running; nothing to deploy."
+                )
+                return
+            self._sync_oss_fuzz_repo()
             self._compose_up()
             self._write_state()
             logging.info("Deployment completed successfully.")
@@ -117,23 +231,24 @@ class DeployManager:
 
     def rollback(self) -> None:
         logging.info("Tearing down environment and cleaning artifacts...")
-        if COMPOSE_FILE.exists():
+        if self._compose_exists:
             try:
                 self._docker_compose_cmd("down", "-v", "--remove-orphans")
             except DeployError as exc:
                 logging.warning("docker compose down failed: %s", exc)
-        for path in (OSS_FUZZ_DIR, ARTIFACT_DIR, LOG_DIR):
-            if path.exists():
-                logging.debug("Removing %s", path)
-                shutil.rmtree(path, ignore_errors=True)
+        # Independent subtrees; unlink-heavy removals overlap well across threads.
+        doomed = [path for path in (OSS_FUZZ_DIR, ARTIFACT_DIR, LOG_DIR) if path.exists()]
+        if doomed:
+            with ThreadPoolExecutor(max_workers=len(doomed)) as executor:
+                list(executor.map(_remove_tree, doomed))
         if STATE_FILE.exists():
             STATE_FILE.unlink(missing_ok=True)
         logging.info("Rollback completed.")
 
     def status(self) -> None:
         if STATE_FILE.exists():
-            data = json.loads(STATE_FILE.read_text())
-            logging.info("Last deployment: %s", json.dumps(data, indent=2))
+            data = _load_state()
+            logging.info("Last deployment: %s", _dump_state(data).decode())
         else:
             logging.info("No previous deployment state found.")
         try:
@@ -202,13 +317,29 @@ class DeployManager:
             if not installed:
                 raise DeployError(f"Unable to install prerequisite: {name}")
 
+        # Probe results from before the install are stale now.
+        _probe_command.cache_clear()
+
     def _verify_docker_daemon(self) -> None:
+        if self._daemon_ok:
+            return
         try:
-            run_command(["docker", "info"], capture_output=True)
+            # `docker version` only asks the daemon for its version; `docker info`
+            # makes it enumerate containers, images, volumes and plugins.
+            run_command(
+                ["docker", "version", "--format", "{{.Server.Version}}"], capture_output=True
+            )
         except DeployError as exc:
-            raise DeployError(
-                "Docker daemon is unreachable. Ensure it is running and you have permission."
-            ) from exc
+            message = "Docker daemon is unreachable. Ensure it is running and you have permission."
+            # Only a hint: `docker context use` can select a daemon elsewhere
+            # (Docker Desktop, colima) without touching the environment.
+            remote = os.environ.get("DOCKER_HOST") or os.environ.get("DOCKER_CONTEXT")
+            if not remote and not any(socket.exists() for socket in _docker_sockets()):
+                message += (
+                    " No local daemon socket was found; set DOCKER_HOST if it lives elsewhere."
+                )
+            raise DeployError(message) from exc
+        self._daemon_ok = True
 
     def _prepare_directories(self) -> None:
         for path in (ARTIFACT_DIR, LOG_DIR, CONFIG_DIR):
@@ -219,13 +350,76 @@ class DeployManager:
             logging.info("Force reclone requested; deleting existing oss-fuzz checkout.")
             shutil.rmtree(OSS_FUZZ_DIR, ignore_errors=True)
 
+        if OSS_FUZZ_DIR.exists() and not (OSS_FUZZ_DIR / ".git").is_file():
+            # Standalone clones from older deployments are replaced by a mirror worktree.
+            logging.info("Replacing standalone oss-fuzz clone with a mirror worktree.")
+            shutil.rmtree(OSS_FUZZ_DIR, ignore_errors=True)
+
         if OSS_FUZZ_DIR.exists():
             logging.info("Updating existing oss-fuzz checkout...")
-            run_command(["git", "fetch", "--all"], cwd=OSS_FUZZ_DIR)
-            run_command(["git", "reset", "--hard", "origin/master"], cwd=OSS_FUZZ_DIR)
         else:
-            logging.info("Cloning oss-fuzz repository...")
-            run_command(["git", "clone", "--depth", "1", REPO_URL, str(OSS_FUZZ_DIR)])
+            logging.info("Creating oss-fuzz checkout from the local mirror...")
+            run_command(["git", "worktree", "prune"], cwd=OSS_FUZZ_MIRROR)
+            run_command(
+                [
+                    "git",
+                    "worktree",
+                    "add",
+                    "--detach",
+                    "--no-checkout",
+                    "--force",
+                    str(OSS_FUZZ_DIR),
+                    REPO_BRANCH,
+                ],
+                cwd=OSS_FUZZ_MIRROR,
+            )
+        self._configure_sparse_checkout()
+        run_command(["git", "reset", "--hard", REPO_BRANCH], cwd=OSS_FUZZ_DIR)
+
+    def _configure_sparse_checkout(self) -> None:
+        projects = _configured_projects(CONFIG_DIR / "fuzz_targets.yaml")
+        if not projects:
+            logging.info("Checking out the full oss-fuzz tree.")
+            run_command(["git", "sparse-checkout", "disable"], cwd=OSS_FUZZ_DIR)
+            return
+        logging.info("Limiting oss-fuzz checkout to infra/ and %s project(s).", len(projects))
+        run_command(
+            [
+                "git",
+                "sparse-checkout",
+                "set",
+                "--cone",
+                "infra",
+                *(f"projects/{project}" for project in projects),
+            ],
+            cwd=OSS_FUZZ_DIR,
+        )
+
+    def _sync_mirror(self) -> None:
+        if OSS_FUZZ_MIRROR.exists():
+            logging.info("Updating oss-fuzz mirror...")
+            run_command(
+                ["git", "fetch", "--depth", "1", "origin", f"+{REPO_BRANCH}:{REPO_BRANCH}"],
+                cwd=OSS_FUZZ_MIRROR,
+            )
+        else:
+            logging.info("Cloning oss-fuzz mirror...")
+            OSS_FUZZ_MIRROR.parent.mkdir(parents=True, exist_ok=True)
+            run_command(
+                [
+                    "git",
+                    "clone",
+                    "--bare",
+                    "--depth",
+                    "1",
+                    f"--filter={CLONE_FILTER}",
+                    "--single-branch",
+                    "--branch",
+                    REPO_BRANCH,
+                    REPO_URL,
+                    str(OSS_FUZZ_MIRROR),
+                ]
+            )
 
     def _ensure_config(self) -> None:
         config_file = CONFIG_DIR / "fuzz_targets.yaml"
@@ -235,36 +429,83 @@ class DeployManager:
                 "Please create it or copy the provided example."
             )
 
-    def _build_images(self) -> None:
-        logging.info("Building docker images (this may take a while)...")
-        self._docker_compose_cmd("build", "--pull")
-
     def _compose_up(self) -> None:
-        logging.info("Starting docker compose stack...")
-        self._docker_compose_cmd("up", "-d", "--remove-orphans")
+        if self.skip_build:
+            logging.info("Starting docker compose stack...")
+            self._docker_compose_cmd("up", "-d", "--remove-orphans")
+            return
 
-    def _write_state(self) -> None:
-        commit = None
-        if OSS_FUZZ_DIR.exists():
-            result = run_command(["git", "rev-parse", "HEAD"], cwd=OSS_FUZZ_DIR, capture_output=True)
-            commit = result.stdout.strip()
+        logging.info("Building images and starting docker compose stack (this may take a while)...")
+        if self.compose_base_cmd == ["docker-compose"]:
+            # Legacy docker-compose has no `up --pull`, so keep the separate build.
+            self._docker_compose_cmd("build", "--pull", "--parallel", env=BUILD_ENV)
+            self._docker_compose_cmd("up", "-d", "--remove-orphans")
+        else:
+            self._docker_compose_cmd(
+                "up", "-d", "--build", "--pull", "always", "--remove-orphans", env=BUILD_ENV
+            )
 
+    def _write_state(self) -> None:
+        commit = self._current_commit()
         state = {
             "timestamp": int(time.time()),
             "oss_fuzz_commit": commit,
             "compose_file": str(COMPOSE_FILE),
+            "state_hash": _state_hash(commit),
         }
-        STATE_FILE.write_text(json.dumps(state, indent=2))
+        STATE_FILE.write_bytes(_dump_state(state))
+
+    def _current_commit(self) -> str | None:
+        if not OSS_FUZZ_DIR.exists():
+            return None
+        result = run_command(["git", "rev-parse", "HEAD"], cwd=OSS_FUZZ_DIR, capture_output=True)
+        return result.stdout.strip()
 
-    def _docker_compose_cmd(self, *args: str) -> None:
-        if not COMPOSE_FILE.exists():
+    def _mirror_commit(self) -> str:
+        result = run_command(
+            ["git", "rev-parse", REPO_BRANCH], cwd=OSS_FUZZ_MIRROR, capture_output=True
+        )
+        return result.stdout.strip()
+
+    def _maybe_skip(self) -> bool:
+        """Return True when the last deploy used identical inputs and is still running."""
+        if self.force_reclone or not STATE_FILE.exists() or not OSS_FUZZ_DIR.exists():
+            return False
+        try:
+            previous = _load_state().get("state_hash")
+            # The worktree is reset to the mirror's branch on deploy, so the freshly
+            # fetched branch tip is what a redeploy would check out.
+            if not previous or previous != _state_hash(self._mirror_commit()):
+                return False
+            expected = self._compose_services("config", "--services")
+            running = self._compose_services("ps", "--services", "--filter", "status=running")
+        except (OSError, ValueError, DeployError) as exc:
+            logging.debug("Unable to compare against previous deployment: %s", exc)
+            return False
+        return bool(expected) and expected <= running
+
+    def _compose_services(self, *args: str) -> Set[str]:
+        result = self._docker_compose_cmd(*args, capture_output=True)
+        return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+
+    def _docker_compose_cmd(
+        self,
+        *args: str,
+        env: Mapping[str, str] | None = None,
+        capture_output: bool = False,
+    ) -> subprocess.CompletedProcess:
+        if not self._compose_exists:
             raise DeployError(f"docker compose file is missing at {COMPOSE_FILE}")
         if self.compose_base_cmd is None and not self._detect_compose_command():
             raise DeployError(
                 "Docker Compose command is unavailable. "
                 "Re-run prerequisite checks or install docker-compose."
             )
-        run_command([*self.compose_base_cmd, "-f", str(COMPOSE_FILE), *args])
+        return run_command(
+            [*self.compose_base_cmd, "-f", str(COMPOSE_FILE), *args],
+            env=env,
+            capture_output=capture_output,
+        )
 
     def _collect_missing_prereqs(self, *, log: bool) -> List[str]:
         missing: List[str] = []
@@ -308,7 +549,7 @@ class DeployManager:
         return False
 
 
-def parse_args(argv: List[str]) -> argparse.Namespace:
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -331,7 +572,10 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     deploy_parser.add_argument(
         "--force-reclone",
         action="store_true",
-        help="Force delete and reclone the oss-fuzz repository.",
+        help=(
+            "Force delete and reclone the oss-fuzz repository "
+            "(also redeploys when nothing changed since the last deploy)."
+        ),
     )
 
     subparsers.add_parser("rollback", help="Rollback and clean all resources")
@@ -343,7 +587,15 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
         help="Set logging verbosity.",
     )
-    return parser.parse_args(argv)
+    return parser
+
+
+# Built once at import; main() may be re-entered by wrappers and test harnesses.
+_PARSER = _build_parser()
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    return _PARSER.parse_args(argv)
 
 
 def main(argv: List[str]) -> int:
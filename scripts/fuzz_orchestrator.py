@@ -10,18 +10,89 @@ stdout and target-specific artifact directories for later triage.
 from __future__ import annotations
 
 import argparse
+import contextlib
+import copy
 import dataclasses
+import fcntl
+import functools
+import hashlib
+import json
 import logging
+import mmap
 import os
+import select
+import signal
 import subprocess
 import sys
+import threading
+import time
+import uuid
+import weakref
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Type
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader  # type: ignore[assignment]
+
+try:
+    import fastjsonschema
+except ImportError:  # Optional; FuzzTarget.from_dict performs the same checks.
+    fastjsonschema = None  # type: ignore[assignment]
+
 EnvMap = Dict[str, str]
+# (name, project, fuzz_target, enabled, sanitizer, dictionary, env items, args, max_run_seconds)
+TargetKey = Tuple[
+    str, str, str, bool, str, Optional[str], Tuple[Tuple[str, str], ...], Tuple[str, ...], int
+]
+HELPER_DAEMON = Path(__file__).resolve().with_name("helper_daemon.py")
+READ_CHUNK_SIZE = 1 << 16
+LOG_BATCH_LINES = 50
+STOP_GRACE_SECONDS = 5.0
+
+# At least as strict as the checks in load_targets/FuzzTarget.from_dict, so a
+# document that passes can skip them; one that fails takes the per-entry path
+# for detailed error messages.
+_NON_EMPTY_STRING = {"type": "string", "minLength": 1}
+CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ["targets"],
+    "properties": {
+        "targets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "project", "fuzz_target"],
+                "properties": {
+                    "name": _NON_EMPTY_STRING,
+                    "project": _NON_EMPTY_STRING,
+                    "fuzz_target": _NON_EMPTY_STRING,
+                    "binaries": {"type": ["array", "null"], "items": {"type": "object"}},
+                    "environment": {"type": ["object", "null"]},
+                },
+            },
+        },
+    },
+}
+_CONFIG_VALIDATOR = fastjsonschema.compile(CONFIG_SCHEMA) if fastjsonschema else None
+# Children get their own process group so stop_helpers() can signal the whole
+# tree. process_group=0 (3.11+) is a plain setpgid() that keeps CPython's vfork
+# spawn path; older interpreters fall back to setsid().
+SPAWN_GROUP_KWARGS: Dict[str, Any] = (
+    {"process_group": 0} if sys.version_info >= (3, 11) else {"start_new_session": True}
+)
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_CPU_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_CPU_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+# Helper processes currently executing a command, so a failure can stop them all.
+_LIVE_PROCESSES: "weakref.WeakSet[subprocess.Popen[bytes]]" = weakref.WeakSet()
+_LIVE_LOCK = threading.Lock()
+_STOP_EVENT = threading.Event()
 
 
 @dataclasses.dataclass(slots=True)
@@ -33,43 +104,65 @@ class FuzzTarget:
     sanitizer: str = "address"
     dictionary: Optional[Path] = None
     environment: EnvMap = dataclasses.field(default_factory=dict)
-    fuzzer_args: List[str] = dataclasses.field(default_factory=list)
+    fuzzer_args: Tuple[str, ...] = ()
     max_run_seconds: int = 900
+    prebuilt_build_args: Tuple[str, ...] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    prebuilt_args: Tuple[str, ...] = dataclasses.field(init=False, repr=False, compare=False)
+    prebuilt_env_delta: Mapping[str, str] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.prebuilt_build_args = self.build_args()
+        self.prebuilt_args = self.run_args()
+        self.prebuilt_env_delta = self.environment | {
+            "FUZZ_TARGET": self.fuzz_target,
+            "FUZZ_PROJECT": self.project,
+            "SANITIZER": self.sanitizer,
+        }
 
     @classmethod
-    def from_dict(cls, data: Dict) -> "FuzzTarget":
-        required = ("name", "project", "fuzz_target")
-        missing = [field for field in required if not data.get(field)]
-        if missing:
-            raise OrchestratorError(
-                f"Missing required field(s) {missing} in target definition."
-            )
+    def from_dict(cls, data: Dict, prevalidated: bool = False) -> "FuzzTarget":
+        """Build a target from a config entry; ``prevalidated`` skips the schema checks."""
+        if not prevalidated:
+            required = ("name", "project", "fuzz_target")
+            missing = [field for field in required if not data.get(field)]
+            if missing:
+                raise OrchestratorError(
+                    f"Missing required field(s) {missing} in target definition."
+                )
 
         binaries = data.get("binaries") or []
         default_run_seconds = binaries[0].get("max_run_seconds", 900) if binaries else 900
         default_args_raw = binaries[0].get("args", []) if binaries else []
-        default_args = [str(arg) for arg in default_args_raw]
+        default_args = tuple(str(arg) for arg in default_args_raw)
         dictionary = data.get("dictionary")
 
-        dictionary_path = Path(dictionary) if dictionary else None
         environment_raw = data.get("environment", {}) or {}
-        if not isinstance(environment_raw, dict):
+        if not prevalidated and not isinstance(environment_raw, dict):
             raise OrchestratorError(
                 f"Environment for target {data.get('name')} must be a mapping."
             )
-        environment: EnvMap = {str(key): str(value) for key, value in environment_raw.items()}
-
-        return cls(
-            name=data["name"],
-            project=data["project"],
-            fuzz_target=data["fuzz_target"],
-            enabled=data.get("enabled", True),
-            sanitizer=data.get("sanitizer", "address"),
-            dictionary=dictionary_path,
-            environment=environment,
-            fuzzer_args=default_args,
-            max_run_seconds=int(data.get("max_run_seconds", default_run_seconds)),
+        environment = sorted((str(key), str(value)) for key, value in environment_raw.items())
+
+        key: TargetKey = (
+            data["name"],
+            data["project"],
+            data["fuzz_target"],
+            data.get("enabled", True),
+            data.get("sanitizer", "address"),
+            str(dictionary) if dictionary else None,
+            tuple(environment),
+            default_args,
+            int(data.get("max_run_seconds", default_run_seconds)),
         )
+        try:
+            # Copy so validate() on one load never mutates the cached instance.
+            return copy.copy(_build_target(cls, key))
+        except TypeError:  # unhashable YAML value somewhere in the key
+            return _build_target.__wrapped__(cls, key)
 
     def validate(self) -> None:
         if self.max_run_seconds <= 0:
@@ -83,148 +176,641 @@ class FuzzTarget:
                 self.dictionary,
             )
             self.dictionary = None
+            self.prebuilt_args = self.run_args()
 
-    def build_args(self) -> List[str]:
-        return [
-            "build_fuzzers",
-            f"--sanitizer={self.sanitizer}",
-            self.project,
-        ]
+    def build_args(self) -> Tuple[str, ...]:
+        return ("build_fuzzers", f"--sanitizer={self.sanitizer}", self.project)
 
-    def run_args(self) -> List[str]:
-        args = [
+    def run_args(self) -> Tuple[str, ...]:
+        return (
             "run_fuzzer",
             f"--sanitizer={self.sanitizer}",
             f"--max_total_time={self.max_run_seconds}",
-        ]
-        if self.dictionary:
-            args.extend(["--dict", str(self.dictionary)])
-        args.extend([self.project, self.fuzz_target])
-        if self.fuzzer_args:
-            args.append("--")
-            args.extend(self.fuzzer_args)
-        return args
+            *(("--dict", str(self.dictionary)) if self.dictionary else ()),
+            self.project,
+            self.fuzz_target,
+            *(("--", *self.fuzzer_args) if self.fuzzer_args else ()),
+        )
 
 
 class OrchestratorError(Exception):
     """Raised when orchestration fails."""
 
 
-def load_targets(config_path: Path) -> List[FuzzTarget]:
-    if not config_path.exists():
-        raise OrchestratorError(f"Config file not found: {config_path}")
+@functools.lru_cache(maxsize=256)
+def _build_target(cls: Type[FuzzTarget], key: TargetKey) -> FuzzTarget:
+    """Construct a target from its canonical key; identical entries share the work."""
+    (
+        name,
+        project,
+        fuzz_target,
+        enabled,
+        sanitizer,
+        dictionary,
+        environment,
+        fuzzer_args,
+        max_run_seconds,
+    ) = key
+    return cls(
+        name=name,
+        project=project,
+        fuzz_target=fuzz_target,
+        enabled=enabled,
+        sanitizer=sanitizer,
+        dictionary=Path(dictionary) if dictionary else None,
+        environment=dict(environment),
+        fuzzer_args=fuzzer_args,
+        max_run_seconds=max_run_seconds,
+    )
+
+
+def _default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "oss-auto-fuzz"
+
 
-    data = yaml.safe_load(config_path.read_text())
-    if not isinstance(data, dict):
-        raise OrchestratorError("Config root must be a mapping/object.")
+def _config_cache_path(config_path: Path, cache_dir: Path) -> Path:
+    # Keyed by the resolved path: the config directory itself is mounted
+    # read-only in the runner, so the cache cannot live next to it.
+    name = hashlib.sha256(str(config_path.resolve()).encode()).hexdigest()[:16]
+    return cache_dir / f"config-{name}.json"
+
+
+def _json_roundtrips(node: object) -> bool:
+    """True if every mapping key is a str; json.dumps would silently stringify others."""
+    if isinstance(node, dict):
+        return all(
+            isinstance(key, str) and _json_roundtrips(value) for key, value in node.items()
+        )
+    if isinstance(node, list):
+        return all(_json_roundtrips(item) for item in node)
+    return True
 
-    targets_raw = data.get("targets")
-    if not isinstance(targets_raw, list):
-        raise OrchestratorError("Config must contain a 'targets' list.")
 
-    parsed: List[FuzzTarget] = []
+def _load_config_data(config_path: Path, cache_dir: Path) -> object:
+    """Parse the YAML config, reusing a JSON copy while the file is unchanged."""
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        raise OrchestratorError(f"Config file not found: {config_path}") from None
+    key = [stat.st_mtime_ns, stat.st_size]
+    cache_path = _config_cache_path(config_path, cache_dir)
+    try:
+        cached = json.loads(cache_path.read_bytes())
+        if cached["key"] == key:
+            return cached["data"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logging.debug("Ignoring unreadable config cache %s: %s", cache_path, exc)
+
+    if not yaml.__with_libyaml__:
+        logging.warning("PyYAML lacks libyaml bindings; parsing config with the pure-Python loader.")
+    if stat.st_size == 0:
+        data = None  # mmap cannot map an empty file; YAML treats it as null anyway.
+    else:
+        # libyaml pulls the document straight from the mapping in small reads, so
+        # large generated configs never exist as one bytes object in memory.
+        with open(config_path, "rb") as handle, mmap.mmap(
+            handle.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            data = yaml.load(mapped, Loader=YamlLoader)
+
+    # YAML 1.1 keys such as ON/null would come back from JSON as "true"/"null".
+    if not _json_roundtrips(data):
+        logging.debug("Not caching %s: it has non-string mapping keys.", config_path)
+        return data
+
+    # Caching is best effort; an unwritable cache directory only costs a re-parse.
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps({"key": key, "data": data}))
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as exc:
+        # TypeError/ValueError: YAML values JSON cannot represent (e.g. dates).
+        logging.debug("Unable to write config cache %s: %s", cache_path, exc)
+        tmp_path.unlink(missing_ok=True)
+    return data
+
+
+def _matches_schema(data: object) -> bool:
+    if _CONFIG_VALIDATOR is None:
+        return False
+    try:
+        _CONFIG_VALIDATOR(data)
+    except fastjsonschema.JsonSchemaException:
+        return False
+    return True
+
+
+def load_targets(config_path: Path, cache_dir: Optional[Path] = None) -> List[FuzzTarget]:
+    data = _load_config_data(config_path, cache_dir or _default_cache_dir())
+    prevalidated = _matches_schema(data)
+    if not prevalidated:
+        if not isinstance(data, dict):
+            raise OrchestratorError("Config root must be a mapping/object.")
+        if not isinstance(data.get("targets"), list):
+            raise OrchestratorError("Config must contain a 'targets' list.")
+    targets_raw = data["targets"]  # type: ignore[index]
+
+    enabled_targets: List[FuzzTarget] = []
+    seen: Set[str] = set()
     errors: List[str] = []
     for index, entry in enumerate(targets_raw, start=1):
+        name = entry.get("name") if isinstance(entry, dict) else "<invalid>"
+        # Only enabled targets share artifact directories, so only they must be unique.
+        enabled = isinstance(entry, dict) and entry.get("enabled", True)
+        if enabled and isinstance(name, str):
+            if name in seen:
+                errors.append(f"entry #{index} ({name}): duplicate target name")
+                continue
+            seen.add(name)
         try:
-            target = FuzzTarget.from_dict(entry)
+            target = FuzzTarget.from_dict(entry, prevalidated)
             target.validate()
-            parsed.append(target)
         except OrchestratorError as exc:
-            name = entry.get("name") if isinstance(entry, dict) else "<invalid>"
             errors.append(f"entry #{index} ({name}): {exc}")
+            continue
+        if target.enabled:
+            enabled_targets.append(target)
 
     if errors:
         raise OrchestratorError(
             "Invalid target configuration:\n - " + "\n - ".join(errors)
         )
 
-    enabled_targets = [t for t in parsed if t.enabled]
     if not enabled_targets:
         raise OrchestratorError("No enabled targets found in configuration.")
-
-    _ensure_unique_names(enabled_targets)
     return enabled_targets
 
 
-def _ensure_unique_names(targets: List[FuzzTarget]) -> None:
-    seen: Set[str] = set()
-    duplicates: Set[str] = set()
-    for target in targets:
-        if target.name in seen:
-            duplicates.add(target.name)
+def _merge_env(base: EnvMap, overrides: Optional[Mapping[str, str]] = None) -> EnvMap:
+    return {**base, **(overrides or {})}
+
+
+def _track(process: subprocess.Popen[bytes]) -> None:
+    with _LIVE_LOCK:
+        _LIVE_PROCESSES.add(process)
+    if _STOP_EVENT.is_set():
+        _terminate(process)
+
+
+def _untrack(process: subprocess.Popen[bytes]) -> None:
+    with _LIVE_LOCK:
+        _LIVE_PROCESSES.discard(process)
+
+
+def _signal_group(process: subprocess.Popen[bytes], signum: int) -> None:
+    # Helpers lead their own process group, so this also reaches the docker
+    # client they spawned (which in turn forwards the signal to the container).
+    try:
+        os.killpg(process.pid, signum)
+    except OSError:
+        pass
+
+
+def _group_alive(process: subprocess.Popen[bytes]) -> bool:
+    try:
+        os.killpg(process.pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _terminate(process: subprocess.Popen[bytes]) -> None:
+    if process.poll() is None:
+        _signal_group(process, signal.SIGTERM)
+
+
+def _wait_exit(process: subprocess.Popen[bytes], timeout: float) -> bool:
+    """Wait up to ``timeout`` seconds for ``process`` to exit; True once it is reaped."""
+    if process.poll() is not None:
+        return True
+    # Popen.wait(timeout=...) polls waitpid() with growing sleeps; a pidfd lets
+    # the kernel wake us the moment the child exits (Linux 5.3+).
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is not None:
+        try:
+            pidfd = pidfd_open(process.pid)
+        except OSError:
+            pass
         else:
-            seen.add(target.name)
-    if duplicates:
-        raise OrchestratorError(
-            f"Duplicate target names detected: {', '.join(sorted(duplicates))}"
-        )
+            try:
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                poller.poll(timeout * 1000)
+            finally:
+                os.close(pidfd)
+            return process.poll() is not None
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return False
+    return True
+
+
+def stop_helpers() -> None:
+    """Refuse new helper commands and stop the ones still running.
+
+    Each helper process group gets SIGTERM, then SIGKILL if any member is still
+    around after STOP_GRACE_SECONDS.
+    """
+    _STOP_EVENT.set()
+    with _LIVE_LOCK:
+        processes = list(_LIVE_PROCESSES)
+    for process in processes:
+        _terminate(process)
+
+    deadline = time.monotonic() + STOP_GRACE_SECONDS
+    while processes and time.monotonic() < deadline:
+        # The group, not just its leader: a docker client may outlive the helper
+        # and keep the output pipe (and so the worker thread) open.
+        processes = [process for process in processes if _group_alive(process)]
+        if processes:
+            time.sleep(0.1)
+    for process in processes:
+        logging.warning("Helper process group %s ignored SIGTERM; killing it.", process.pid)
+        _signal_group(process, signal.SIGKILL)
+
+
+def _abort(executor: ThreadPoolExecutor) -> None:
+    stop_helpers()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class OutputSink:
+    """Appends helper output to a log descriptor and forwards whole lines to logging."""
+
+    def __init__(self, fd: int, label: str, header: bytes = b"") -> None:
+        self.fd = fd
+        self.label = label
+        # One logger per label, so e.g. "helper.build" can be silenced on its own.
+        self.logger = logging.getLogger(f"helper.{label.replace(':', '.')}")
+        self.forward = self.logger.isEnabledFor(logging.INFO)
+        self._prefix = f"[{label}] "
+        self._header = header
+        self._partial = b""
+
+    def write(self, chunk: bytes) -> None:
+        if self._header:
+            os.writev(self.fd, [self._header, chunk])
+            self._header = b""
+        else:
+            os.write(self.fd, chunk)
+        if not self.forward:
+            return
+        *lines, self._partial = (self._partial + chunk).split(b"\n")
+        self._emit(lines)
+
+    def close(self) -> None:
+        if self._header:
+            os.write(self.fd, self._header)
+            self._header = b""
+        if self._partial:
+            self._emit([self._partial])
+            self._partial = b""
+
+    def _emit(self, lines: List[bytes]) -> None:
+        for start in range(0, len(lines), LOG_BATCH_LINES):
+            batch = lines[start:start + LOG_BATCH_LINES]
+            self.logger.info(
+                "%s",
+                "\n".join(
+                    self._prefix + line.decode("utf-8", "replace").rstrip() for line in batch
+                ),
+            )
 
 
-def _merge_env(base: EnvMap, overrides: Optional[EnvMap] = None) -> EnvMap:
-    env = base.copy()
-    if overrides:
-        env.update(overrides)
-    return env
+class HelperSession:
+    """Long-lived helper_daemon.py process that runs one helper command at a time."""
 
+    def __init__(self, helper: Path, env: EnvMap) -> None:
+        self.sentinel = f"__helper_done_{uuid.uuid4().hex}__".encode()
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", str(HELPER_DAEMON), str(helper), self.sentinel.decode()],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=READ_CHUNK_SIZE,
+            env=env,
+            **SPAWN_GROUP_KWARGS,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
 
-def run_helper(helper: Path, args: List[str], env: EnvMap, log_path: Path, label: str) -> None:
+    def run(self, args: Sequence[str], env: EnvMap, sink: OutputSink) -> int:
+        assert self.process.stdin and self.process.stdout
+        request = json.dumps({"argv": args, "env": env}) + "\n"
+        _track(self.process)
+        try:
+            self.process.stdin.write(request.encode())
+            self.process.stdin.flush()
+
+            pending = b""
+            while True:
+                pending += self._read()
+                index = pending.find(self.sentinel)
+                if index == -1:
+                    # Hold back only a possible sentinel prefix split across two
+                    # reads, so quiet output still reaches the log right away.
+                    keep = self._sentinel_overlap(pending)
+                    if len(pending) > keep:
+                        sink.write(pending[:len(pending) - keep])
+                        pending = pending[len(pending) - keep:]
+                    continue
+                if index:
+                    sink.write(pending[:index])
+                status = pending[index + len(self.sentinel):]
+                while b"\n" not in status:
+                    status += self._read()
+                return int(status.split(b"\n", 1)[0])
+        finally:
+            _untrack(self.process)
+
+    def _sentinel_overlap(self, data: bytes) -> int:
+        """Length of the longest suffix of ``data`` that starts the sentinel."""
+        start = data.find(self.sentinel[:1], max(0, len(data) - len(self.sentinel) + 1))
+        while start != -1:
+            if self.sentinel.startswith(data[start:]):
+                return len(data) - start
+            start = data.find(self.sentinel[:1], start + 1)
+        return 0
+
+    def _read(self) -> bytes:
+        assert self.process.stdout
+        # Bypass the buffered reader; one read(2) per chunk is all we need.
+        chunk = os.read(self.process.stdout.fileno(), READ_CHUNK_SIZE)
+        if not chunk:
+            raise OrchestratorError(
+                f"Helper session exited (code {self.process.wait()}) before completing the command."
+            )
+        return chunk
+
+    def close(self) -> None:
+        if self.process.stdin:
+            self.process.stdin.close()
+        if not _wait_exit(self.process, 5):
+            # The whole group: a docker client that ignored SIGTERM must not survive.
+            _signal_group(self.process, signal.SIGKILL)
+            self.process.wait()
+        if self.process.stdout:
+            self.process.stdout.close()
+
+
+class HelperSessionPool:
+    """Hands out idle helper sessions so builds and runs reuse warm interpreters."""
+
+    def __init__(self, helper: Path, env: EnvMap) -> None:
+        self.helper = helper
+        self.env = env
+        self._idle: List[HelperSession] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> HelperSession:
+        with self._lock:
+            while self._idle:
+                session = self._idle.pop()
+                if session.alive:
+                    return session
+        return HelperSession(self.helper, self.env)
+
+    def release(self, session: HelperSession) -> None:
+        if session.alive:
+            with self._lock:
+                self._idle.append(session)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            session.close()
+
+
+def _run_subprocess(cmd: Sequence[str], env: EnvMap, sink: OutputSink) -> int:
+    # Popen's context manager closes the pipe and reaps the child on every path.
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=0,
+        env=env,
+        **SPAWN_GROUP_KWARGS,
+    ) as process:
+        _track(process)
+        try:
+            fd = process.stdout.fileno()
+            while chunk := os.read(fd, READ_CHUNK_SIZE):
+                sink.write(chunk)
+            return process.wait()
+        except BaseException:
+            # Don't let the implicit wait() block on a helper that is still running.
+            # Once untracked, stop_helpers() can no longer escalate, so do it here.
+            _terminate(process)
+            _wait_exit(process, STOP_GRACE_SECONDS)
+            _signal_group(process, signal.SIGKILL)
+            raise
+        finally:
+            _untrack(process)
+
+
+def run_helper(
+    helper: Path,
+    args: Sequence[str],
+    env: EnvMap,
+    log_path: Path,
+    label: str,
+    pool: Optional[HelperSessionPool] = None,
+) -> None:
+    if _STOP_EVENT.is_set():
+        raise OrchestratorError("Aborted before start; another helper command failed.")
     log_path.parent.mkdir(parents=True, exist_ok=True)
-    cmd = ["python3", str(helper), *args]
+    cmd = (sys.executable, str(helper), *args)
     logging.debug("Executing helper (%s): %s", label, " ".join(cmd))
 
-    process: subprocess.Popen[str] | None = None
     try:
-        with log_path.open("a", encoding="utf-8") as logfile:
-            logfile.write(f"\n=== Running ({label}): {' '.join(cmd)} ===\n")
-            logfile.flush()
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                env=env,
-            )
-            assert process.stdout
-            for line in process.stdout:
-                logfile.write(line)
-                logfile.flush()
-                logging.info("[%s] %s", label, line.rstrip())
-            returncode = process.wait()
+        with contextlib.ExitStack() as stack:
+            # Unbuffered O_APPEND writes: each chunk is one write(2), with no file
+            # object lock shared between worker threads.
+            fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            stack.callback(os.close, fd)
+            header = f"\n=== Running ({label}): {' '.join(cmd)} ===\n".encode()
+            sink = stack.enter_context(contextlib.closing(OutputSink(fd, label, header)))
+            if pool is None:
+                returncode = _run_subprocess(cmd, env, sink)
+            else:
+                session = pool.acquire()
+                try:
+                    returncode = session.run(args, env, sink)
+                except BaseException:
+                    # Dead, killed, or stuck mid-command: reap it here instead of
+                    # leaving it to the GC, and never hand it back to the pool.
+                    _terminate(session.process)
+                    session.close()
+                    raise
+                pool.release(session)
+            sink.close()
             if returncode != 0:
-                logfile.write(f"\nCommand failed with exit code {returncode}\n")
-                logfile.flush()
+                os.write(fd, f"\nCommand failed with exit code {returncode}\n".encode())
                 raise OrchestratorError(
                     f"Helper command {' '.join(args)} failed (exit {returncode})"
                 )
     except OSError as exc:
         raise OrchestratorError(f"Failed to execute helper: {exc}") from exc
+
+
+def _build_digest(oss_fuzz_dir: Path, project: str, sanitizer: str) -> str:
+    """Fingerprint a project build: the sanitizer plus its oss-fuzz project files."""
+    digest = hashlib.sha256(f"{project}\0{sanitizer}\0".encode())
+    project_dir = oss_fuzz_dir / "projects" / project
+    for root, dirs, files in os.walk(project_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            # lstat: a dangling symlink is an input like any other, not an error.
+            stat = os.lstat(path)
+            relative = os.path.relpath(path, project_dir)
+            digest.update(f"{relative}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode())
+    return digest.hexdigest()
+
+
+def _build_is_current(oss_fuzz_dir: Path, stamp: Path, digest: str, project: str) -> bool:
+    # build/out/<project> holds a single build, so one stamp per project
+    # records which sanitizer/inputs produced it.
+    if not (oss_fuzz_dir / "build" / "out" / project).is_dir():
+        return False
+    try:
+        return stamp.read_text(encoding="utf-8").strip() == digest
+    except OSError:
+        return False
+
+
+@contextlib.contextmanager
+def _project_build_lock(oss_fuzz_dir: Path, project: str) -> Iterator[None]:
+    """Hold an exclusive flock on the project's build lock for the duration of a build.
+
+    build/out/<project> is shared by every sanitizer and by every orchestrator using
+    the same checkout, so builds of one project must never overlap.
+    """
+    # Lives next to what it guards, so orchestrators with different --artifacts
+    # directories still serialize on a shared checkout.
+    lock_path = oss_fuzz_dir / "build" / f".{project}.lock"
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        announced = False
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if not announced:
+                    logging.info("Waiting for another build of %s to finish.", project)
+                    announced = True
+            # Poll rather than block so an abort is noticed within a second.
+            if _STOP_EVENT.wait(1.0):
+                raise OrchestratorError(f"Aborted while waiting for the {project} build lock.")
+        yield
     finally:
-        if process and process.stdout:
-            process.stdout.close()
+        os.close(fd)
 
 
 def build_projects(
     helper: Path,
     targets: List[FuzzTarget],
     artifacts: Path,
+    max_parallel_builds: int,
     base_env: EnvMap,
+    pool: Optional[HelperSessionPool] = None,
+    force: bool = False,
 ) -> None:
-    built: Set[Tuple[str, str]] = set()
+    # Each phase starts fresh; an earlier failed call must not abort this one.
+    _STOP_EVENT.clear()
+    oss_fuzz_dir = helper.parent.parent
+    jobs: Dict[Tuple[str, str], Tuple[FuzzTarget, EnvMap, Path, Path, str]] = {}
+    current: Set[Tuple[str, str]] = set()
     for target in targets:
         key = (target.project, target.sanitizer)
-        if key in built:
+        if key in jobs or key in current:
+            continue
+        # Next to build/out, so every orchestrator on this checkout sees which
+        # build is actually in there, whatever its --artifacts directory.
+        stamp = oss_fuzz_dir / "build" / f".{target.project}.build-stamp"
+        try:
+            digest = _build_digest(oss_fuzz_dir, target.project, target.sanitizer)
+        except OSError as exc:
+            raise OrchestratorError(
+                f"Unable to fingerprint project {target.project}: {exc}"
+            ) from exc
+        if not force and _build_is_current(oss_fuzz_dir, stamp, digest, target.project):
+            current.add(key)
+            logging.info(
+                "Skipping build of %s (%s); project files unchanged since the last build.",
+                target.project,
+                target.sanitizer,
+            )
             continue
         log_file = artifacts / target.name / "build.log"
-        env = _merge_env(base_env, target.environment)
+        jobs[key] = (target, _merge_env(base_env, target.environment), log_file, stamp, digest)
+
+    if not jobs:
+        return
+    worker_count = max(1, min(max_parallel_builds, len(jobs)))
+    logging.info(
+        "Building %s project/sanitizer pair(s) with up to %s parallel worker(s).",
+        len(jobs),
+        worker_count,
+    )
+
+    def execute(
+        target: FuzzTarget, env: EnvMap, log_file: Path, stamp: Path, digest: str
+    ) -> None:
         logging.info(
             "Building project %s for sanitizer %s (target: %s)",
             target.project,
             target.sanitizer,
             target.name,
         )
-        run_helper(helper, target.build_args(), env, log_file, label=f"build:{target.project}:{target.sanitizer}")
-        built.add(key)
+        with _project_build_lock(oss_fuzz_dir, target.project):
+            # Another orchestrator may have finished the same build while we waited.
+            if not force and _build_is_current(oss_fuzz_dir, stamp, digest, target.project):
+                logging.info(
+                    "Build of %s (%s) completed elsewhere.", target.project, target.sanitizer
+                )
+                return
+            # Drop the stamp first so an interrupted build is never considered current.
+            stamp.unlink(missing_ok=True)
+            run_helper(
+                helper,
+                target.prebuilt_build_args,
+                env,
+                log_file,
+                label=f"build:{target.project}:{target.sanitizer}",
+                pool=pool,
+            )
+            stamp.write_text(f"{digest}\n", encoding="utf-8")
+
+    executor = ThreadPoolExecutor(max_workers=worker_count)
+    try:
+        future_map = {
+            executor.submit(execute, *job): key for key, job in jobs.items()
+        }
+        for future in as_completed(future_map):
+            project, sanitizer = future_map[future]
+            try:
+                future.result()
+            except Exception as exc:  # noqa: BLE001
+                raise OrchestratorError(
+                    f"Build of {project} ({sanitizer}) failed: {exc}"
+                ) from exc
+    except BaseException:
+        _abort(executor)
+        raise
+    executor.shutdown()
 
 
 def run_targets(
@@ -233,7 +819,9 @@ def run_targets(
     artifacts: Path,
     max_parallel: int,
     base_env: EnvMap,
+    pool: Optional[HelperSessionPool] = None,
 ) -> None:
+    _STOP_EVENT.clear()
     worker_count = max(1, min(max_parallel, len(targets)))
     logging.info(
         "Running %s enabled target(s) with up to %s parallel worker(s).",
@@ -241,28 +829,30 @@ def run_targets(
         worker_count,
     )
 
-    def execute(target: FuzzTarget) -> str:
-        log_file = artifacts / target.name / "run.log"
-        env = _merge_env(base_env, target.environment)
-        env.update(
-            {
-                "FUZZ_TARGET": target.fuzz_target,
-                "FUZZ_PROJECT": target.project,
-                "SANITIZER": target.sanitizer,
-                "ARTIFACT_DIR": str(artifacts / target.name),
-            }
-        )
+    # Build every run environment up front, in one dict display each, rather
+    # than copy-then-update inside the workers.
+    envs: Dict[str, EnvMap] = {
+        target.name: {
+            **base_env,
+            **target.prebuilt_env_delta,
+            "ARTIFACT_DIR": str(artifacts / target.name),
+        }
+        for target in targets
+    }
 
+    def execute(target: FuzzTarget) -> str:
         run_helper(
             helper,
-            target.run_args(),
-            env,
-            log_file,
+            target.prebuilt_args,
+            envs[target.name],
+            artifacts / target.name / "run.log",
             label=f"run:{target.name}",
+            pool=pool,
         )
         return target.name
 
-    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+    executor = ThreadPoolExecutor(max_workers=worker_count)
+    try:
         future_map = {executor.submit(execute, target): target for target in targets}
         for future in as_completed(future_map):
             target = future_map[future]
@@ -270,12 +860,45 @@ def run_targets(
                 future.result()
                 logging.info("Target %s completed successfully.", target.name)
             except Exception as exc:  # noqa: BLE001
-                for pending in future_map:
-                    pending.cancel()
                 raise OrchestratorError(f"Target {target.name} failed: {exc}") from exc
+    except BaseException:
+        _abort(executor)
+        raise
+    executor.shutdown()
 
 
-def parse_args(argv: List[str]) -> argparse.Namespace:
+def _cgroup_cpu_limit() -> Optional[float]:
+    """Return the CPU quota of the current cgroup (v2 or v1), if one is set."""
+    try:
+        quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota_us = int(CGROUP_V1_CPU_QUOTA.read_text())
+        period_us = int(CGROUP_V1_CPU_PERIOD.read_text())
+        if quota_us > 0 and period_us > 0:
+            return quota_us / period_us
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """Count CPUs this process may actually use (affinity mask and cgroup quota)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, int(limit))
+    return max(1, cpus)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    cpus = available_cpus()
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--config", default="/workspace/config/fuzz_targets.yaml")
     parser.add_argument("--artifacts", default="/workspace/artifacts")
@@ -283,15 +906,39 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     parser.add_argument(
         "--max-parallel",
         type=int,
-        default=max(1, os.cpu_count() // 4 if os.cpu_count() else 1),
+        default=max(1, cpus // 2),
         help="Maximum number of fuzzers to run in parallel.",
     )
+    parser.add_argument(
+        "--max-parallel-builds",
+        type=int,
+        default=max(1, cpus // 4),
+        help="Maximum number of project builds to run in parallel.",
+    )
+    parser.add_argument(
+        "--force-build",
+        action="store_true",
+        help="Rebuild every project even if its build stamp is current.",
+    )
+    parser.add_argument(
+        "--no-helper-daemon",
+        action="store_true",
+        help="Start a fresh helper.py process per command instead of reusing helper sessions.",
+    )
     parser.add_argument(
         "--log-level",
         default=os.environ.get("ORCHESTRATOR_LOG_LEVEL", "INFO"),
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
     )
-    return parser.parse_args(argv)
+    return parser
+
+
+# Built once at import; main() may be re-entered by wrappers and test harnesses.
+_PARSER = _build_parser()
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    return _PARSER.parse_args(argv)
 
 
 def main(argv: List[str]) -> int:
@@ -310,12 +957,24 @@ def main(argv: List[str]) -> int:
         logging.error("helper.py not found at %s", helper_path)
         return 1
 
+    pool: Optional[HelperSessionPool] = None
     try:
-        targets = load_targets(config_path)
+        targets = load_targets(config_path, artifacts_dir / ".cache")
         artifacts_dir.mkdir(parents=True, exist_ok=True)
-        base_env = os.environ.copy()
-        build_projects(helper_path, targets, artifacts_dir, base_env)
-        run_targets(helper_path, targets, artifacts_dir, args.max_parallel, base_env)
+        # Snapshot the process environment once; per-target envs merge over it.
+        base_env = dict(os.environ)
+        if not args.no_helper_daemon:
+            pool = HelperSessionPool(helper_path, base_env)
+        build_projects(
+            helper_path,
+            targets,
+            artifacts_dir,
+            args.max_parallel_builds,
+            base_env,
+            pool,
+            force=args.force_build,
+        )
+        run_targets(helper_path, targets, artifacts_dir, args.max_parallel, base_env, pool)
     except OrchestratorError as exc:
         logging.error("Orchestration failed: %s", exc)
         return 1
@@ -325,6 +984,9 @@ def main(argv: List[str]) -> int:
     except KeyboardInterrupt:
         logging.warning("Interrupted by user.")
         return 130
+    finally:
+        if pool:
+            pool.close()
     return 0
 
 
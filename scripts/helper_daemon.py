@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Persistent wrapper around oss-fuzz's infra/helper.py.
+
+The orchestrator keeps a few of these processes alive and sends them one JSON
+request per line on stdin ({"argv": [...], "env": {...}}). Each request runs
+helper.main() in-process, so the interpreter start and helper imports are paid
+once per session instead of once per command. Command output is written to
+stdout as usual and terminated by the sentinel token followed by the exit code.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import traceback
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List
+
+
+def _load_helper(helper_path: Path) -> ModuleType:
+    # helper.py imports its siblings (constants, templates) by bare name.
+    sys.path.insert(0, str(helper_path.parent))
+    spec = importlib.util.spec_from_file_location("oss_fuzz_helper", helper_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Unable to load helper from {helper_path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _dispatch(
+    helper: ModuleType, helper_path: Path, argv: List[str], env: Dict[str, str], cwd: str
+) -> int:
+    # helper.main() chdirs into the oss-fuzz checkout; start every request where a
+    # fresh helper.py process would.
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    sys.argv = [str(helper_path), *argv]
+    try:
+        result = helper.main()
+    except SystemExit as exc:
+        result = exc.code
+    except Exception:  # noqa: BLE001
+        traceback.print_exc()
+        return 1
+
+    if result is None:
+        return 0
+    if isinstance(result, int):
+        return result
+    print(result, file=sys.stderr)
+    return 1
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 2:
+        print("usage: helper_daemon.py <helper.py> <sentinel>", file=sys.stderr)
+        return 2
+
+    helper_path = Path(argv[0]).resolve()
+    sentinel = argv[1]
+    cwd = os.getcwd()
+    helper = _load_helper(helper_path)
+
+    # Keep requests on a private descriptor so docker clients spawned by the
+    # helper (e.g. `docker run -i`) can never consume them from stdin.
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+    for raw in requests:
+        if not raw.strip():
+            continue
+        request = json.loads(raw)
+        returncode = _dispatch(helper, helper_path, request["argv"], request["env"], cwd)
+        sys.stderr.flush()
+        sys.stdout.write(f"{sentinel} {returncode}\n")
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))